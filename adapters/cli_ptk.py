@@ -5,28 +5,163 @@ CLI REPL interface for LLM chat.
 This module provides a terminal-based interface using prompt_toolkit.
 """
 
-import os
 import sys
+import time
+import atexit
+import asyncio
+import threading
 import logging
-import json
+from contextlib import contextmanager
 from pathlib import Path
 
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import InMemoryHistory
-import langchain
-
 # Import from core
 from core.config_loader import ConfigLoader
 from core.prompt_builder import PromptBuilder
 from core.memory import SessionMemory
 from core.llm_service import LLMService
-from core.logger import init_logger
+from core.logger import init_logger, flush_logs
+from core.watcher import FileWatcher
+
+
+# Display labels for message types in /history (system messages there are summaries)
+HISTORY_LABELS = {"human": "human", "ai": "ai", "system": "summary"}
+
+# Fixed REPL output, built once rather than per print
+BANNER = "CLI LLM PoC - Type your messages (Ctrl-C to exit)\n" + "=" * 50
+GOODBYE = "\n\nGoodbye!\n"
+RELOAD_NOTICES = {
+    (True, False): "[Config reloaded: config]",
+    (False, True): "[Config reloaded: template]",
+    (True, True): "[Config reloaded: config, template]",
+}
+LOGLEVEL_USAGE = (
+    "Usage: /loglevel [category] [level]\n"
+    "       /loglevel status  (show current levels)\n"
+    "Categories: prompt, http, langchain, all\n"
+    "Levels: DEBUG, INFO, WARNING, ERROR\n"
+    "Example: /loglevel http DEBUG"
+)
+
+# Loggers making up the /loglevel http category
+# (newer OpenAI SDKs use the httpx2/httpcore2 transports)
+HTTP_LOGGER_NAMES = ("openai", "httpx", "httpcore", "httpx2", "httpcore2")
+
+# Noisy library loggers held at WARNING
+QUIET_LOGGER_NAMES = ("asyncio", "urllib3", "watchdog")
+
+# Levels accepted by /loglevel
+LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+LEVEL_NAMES = {level: name for name, level in LOG_LEVELS.items()}
+
+
+def format_level(level: int) -> str:
+    """Name of a log level, from the precomputed map when possible."""
+    return LEVEL_NAMES.get(level) or logging.getLevelName(level)
+
+
+def trim_history_file(path: Path, max_entries: int) -> None:
+    """
+    Keep only the newest entries of a prompt_toolkit FileHistory file.
+
+    FileHistory writes each entry as a "# <timestamp>" line followed by
+    "+"-prefixed content lines, so entries are split on the "#" lines.
+
+    Args:
+        path: History file path
+        max_entries: Maximum number of entries to keep
+    """
+    if not path.exists():
+        return
+
+    lines = path.read_bytes().splitlines(keepends=True)
+    starts = [i for i, line in enumerate(lines) if line.startswith(b"#")]
+    if len(starts) <= max_entries:
+        return
+
+    # Keep the blank separator line preceding the first kept entry
+    first = max(starts[-max_entries] - 1, 0)
+    path.write_bytes(b"".join(lines[first:]))
+
+
+
+def hold_early_input():
+    """
+    Stop the terminal echoing keystrokes typed before the first prompt.
 
+    Keystrokes typed during startup stay queued in the tty and are read by
+    the first prompt; without this the terminal also echoes them wherever
+    the cursor happens to be (e.g. in the middle of log output).
+
+    Returns:
+        Idempotent callable restoring the terminal settings (a no-op when
+        stdin is not a terminal or termios is unavailable)
+    """
+    try:
+        import termios
+    except ImportError:  # Windows
+        return lambda: None
+
+    try:
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        quiet = termios.tcgetattr(fd)
+        quiet[3] &= ~termios.ECHO
+        # TCSANOW keeps pending input (TCSAFLUSH would discard it)
+        termios.tcsetattr(fd, termios.TCSANOW, quiet)
+    except (OSError, ValueError, termios.error):
+        return lambda: None
+
+    restored = False
+
+    def restore():
+        nonlocal restored
+        if not restored:
+            restored = True
+            termios.tcsetattr(fd, termios.TCSANOW, saved)
+
+    # Safety net for exits before the first prompt (e.g. bad config)
+    atexit.register(restore)
+    return restore
+
+@contextmanager
+def block_buffered_stdout():
+    """
+    Turn off stdout line buffering for the duration of the block.
+
+    A terminal stdout is line-buffered, which flushes on every newline in a
+    streamed chunk; with it off, output is flushed only where the caller
+    flushes explicitly. The original setting is restored (and stdout
+    flushed) on exit.
+    """
+    stream = sys.stdout
+    line_buffered = getattr(stream, "line_buffering", False)
+    if line_buffered:
+        stream.reconfigure(line_buffering=False)
+    try:
+        yield
+    finally:
+        if line_buffered:
+            stream.reconfigure(line_buffering=True)
+        stream.flush()
 
 class REPLCLI:
     """Main REPL CLI application."""
 
-    def __init__(self, config_loader, prompt_builder, api_key):
+    # Maximum number of recent messages shown by /history
+    HISTORY_LIMIT = 50
+
+    # Maximum number of input lines kept in the prompt history file
+    INPUT_HISTORY_LIMIT = 1000
+
+    # Maximum stdout flushes per second while streaming a response
+    STREAM_REFRESH_PER_SECOND = 8
+
+    def __init__(self, config_loader, prompt_builder, api_key, verbose_http=False):
         """
         Initialize CLI REPL.
 
@@ -34,9 +169,12 @@ class REPLCLI:
             config_loader: ConfigLoader instance (for hot-reload)
             prompt_builder: PromptBuilder instance (for hot-reload)
             api_key: OpenRouter API key
+            verbose_http: Enable OpenAI SDK debug logging of raw HTTP requests/responses
         """
-        # Enable OpenAI SDK debug logging (shows raw HTTP requests/responses)
-        os.environ["OPENAI_LOG"] = "debug"
+        # Interactive only when both ends are terminals; hold back the echo
+        # of anything typed while starting up until the prompt is drawn
+        self.interactive = sys.stdin.isatty() and sys.stdout.isatty()
+        self.release_early_input = hold_early_input() if self.interactive else None
 
         # Initialize root logger (base level for all loggers)
         base_dir = Path(__file__).parent.parent
@@ -46,6 +184,11 @@ class REPLCLI:
             log_file=str(log_file),
             shell_output=True,
             print_log_init=True,
+            # Batch bursts of DEBUG records into one stdout write; INFO and
+            # above flush immediately so normal output stays in order
+            stream_buffer_capacity=256,
+            # Write logs/cli.log from a background thread
+            file_queue=True,
         )
 
         # Create separate logger categories with individual control
@@ -55,20 +198,33 @@ class REPLCLI:
 
         # Category: http - HTTP request/response logs from OpenAI/httpx
         self.http_logger = logging.getLogger("http")
-        openai_logger = logging.getLogger("openai")
-        openai_logger.setLevel(logging.WARNING)  # Default: hide HTTP logs
-        httpx_logger = logging.getLogger("httpx")
-        httpx_logger.setLevel(logging.WARNING)
-        httpcore_logger = logging.getLogger("httpcore")
-        httpcore_logger.setLevel(logging.WARNING)
+        # Levels are set here rather than via OPENAI_LOG, which the SDK only
+        # reads on import, so /loglevel http stays the single runtime switch
+        http_level = logging.DEBUG if verbose_http else logging.WARNING  # Default: hide HTTP logs
+        get_logger = logging.getLogger
+        self.http_loggers = tuple(get_logger(name) for name in HTTP_LOGGER_NAMES)
+        for http_logger in self.http_loggers:
+            http_logger.setLevel(http_level)
 
         # Category: langchain - LangChain internal processing
         self.langchain_logger = logging.getLogger("langchain")
         self.langchain_logger.setLevel(logging.WARNING)  # Default: hide
 
         # Silence noisy libraries
-        logging.getLogger("asyncio").setLevel(logging.WARNING)
-        logging.getLogger("urllib3").setLevel(logging.WARNING)
+        for name in QUIET_LOGGER_NAMES:
+            get_logger(name).setLevel(logging.WARNING)
+
+        # Resolve each /loglevel category to its Logger objects once, so
+        # the command doesn't repeat logging.getLogger() lookups
+        self.log_categories = {
+            "prompt": ("Prompt logs", (self.prompt_logger,)),
+            "http": ("HTTP logs", self.http_loggers),
+            "langchain": ("LangChain logs", (self.langchain_logger,)),
+        }
+        self.log_categories["all"] = (
+            "All categories",
+            tuple(lg for _, loggers in self.log_categories.values() for lg in loggers),
+        )
 
         # Use prompt logger as main logger
         self.logger = self.prompt_logger
@@ -76,8 +232,8 @@ class REPLCLI:
         # Store API key
         self.api_key = api_key
 
-        # Initialize session memory (adapter-specific)
-        session_memory = SessionMemory()
+        # Initialize session memory (adapter-specific), persisted across restarts
+        session_memory = SessionMemory(base_dir / "data" / "memory.db")
 
         # Initialize LLM service
         self.llm_service = LLMService(
@@ -94,159 +250,247 @@ class REPLCLI:
         # Logging mode toggles
         self.log_full_history = False
         self.langchain_debug = False
-        self.httpx_event_hooks = None  # Store httpx event hooks for patching
-
-        # Prompt toolkit session for REPL
-        self.prompt_session = PromptSession(history=InMemoryHistory())
+        self.debug_callbacks = None  # Callback handlers attached to calls while /debug is on
+        self._history_render = None  # (history revision, rendered /history rows)
+
+        # Prompt toolkit session for REPL, with input history persisted
+        # across runs (capped on open, loaded/saved on a background thread).
+        # Piped or redirected sessions read plain lines instead, skipping
+        # prompt_toolkit's rendering and keeping scripted input out of history
+        self.prompt_session = None
+        if self.interactive:
+            # Deferred: piped sessions never load prompt_toolkit
+            from prompt_toolkit import PromptSession
+            from prompt_toolkit.history import FileHistory, ThreadedHistory
+
+            history_file = base_dir / "data" / "repl_history"
+            history_file.parent.mkdir(parents=True, exist_ok=True)
+            trim_history_file(history_file, self.INPUT_HISTORY_LIMIT)
+            self.prompt_session = PromptSession(
+                history=ThreadedHistory(FileHistory(str(history_file)))
+            )
 
         # Initial load
         try:
             self.llm_service.config_loader.load()
             self.llm_service.prompt_builder.load()
         except Exception as e:
-            self.logger.error(f"Error loading initial configuration: {e}")
+            self.logger.error("Error loading initial configuration: %s", e)
             print(f"Error loading initial configuration: {e}")
             sys.exit(1)
 
+        # Load the API client and tokenizer in the background while the first
+        # message is typed, so the first response starts streaming sooner
+        threading.Thread(target=self.llm_service.warm_up, name="llm-warm-up", daemon=True).start()
+
+        # Slash command dispatch table (command -> handler taking the argument string)
+        self._commands = {
+            "/history": self._cmd_history,
+            "/clear": self._cmd_clear,
+            "/cache": self._cmd_cache,
+            "/memory": self._cmd_memory,
+            "/fullhistorylog": self._cmd_fullhistorylog,
+            "/debug": self._cmd_debug,
+            "/loglevel": self._cmd_loglevel,
+        }
+        self._available_commands = ", ".join(self._commands)
+
+        # Watch config/template on a background thread so the REPL loop only
+        # checks mtimes after a change notification (falls back to polling)
+        self.reload_watcher = FileWatcher([config_loader.config_path, prompt_builder.template_path])
+        if not self.reload_watcher.start():
+            self.reload_watcher = None
+
     def handle_command(self, command: str) -> None:
-        """Handle slash commands."""
-        cmd = command.strip().lower()
-
-        if cmd == "/history":
-            # Dump full conversation history
-            history = self.llm_service.get_history(self.session_id)
-            if not history:
-                self.logger.info("No conversation history yet")
-                return
+        """Handle slash commands by dispatching to the matching _cmd_* method."""
+        head, _, rest = command.strip().partition(" ")
+        handler = self._commands.get(head.lower())
+        if handler is None:
+            self._cmd_unknown(command)
+        else:
+            handler(rest.strip())
+
+    def _cmd_history(self, args: str) -> None:
+        """Dump the most recent window of conversation history."""
+        total = self.llm_service.count_history(self.session_id)
+        if not total:
+            self.logger.info("No conversation history yet")
+            return
+
+        # Reuse the last rendering while the history is unchanged
+        revision = self.llm_service.history_revision(self.session_id)
+        if self._history_render is None or self._history_render[0] != revision:
+            history = self.llm_service.get_history(self.session_id, limit=self.HISTORY_LIMIT)
+            older = total - len(history)
+
+            # Build all rows up front and log them as a single record
+            labels = HISTORY_LABELS
+            rows = [
+                f"[{i}] {labels.get(msg['type'], msg['type'])}: {msg['content']}"
+                for i, msg in enumerate(history, older + 1)
+            ]
+            if older:
+                rows.insert(0, f"... {older} older messages")
+            self._history_render = (revision, "\n".join(rows))
+
+        self.logger.info(
+            "=== Conversation History ===\n%s\n=== Total messages: %d ===",
+            self._history_render[1], total
+        )
 
-            self.logger.info("=== Conversation History ===")
-            for i, msg in enumerate(history, 1):
-                self.logger.info(f"[{i}] {msg['type']}: {msg['content']}")
-            self.logger.info(f"=== Total messages: {len(history)} ===")
-
-        elif cmd == "/clear":
-            # Clear conversation history
-            self.llm_service.clear_history(self.session_id)
-            self.logger.info("Conversation history cleared")
-
-        elif cmd == "/fullhistorylog":
-            # Toggle full history logging mode
-            self.log_full_history = not self.log_full_history
-            status = "enabled" if self.log_full_history else "disabled"
-            self.logger.info(f"Full history logging {status}")
-
-        elif cmd == "/debug":
-            # Toggle LangChain debug mode (shows internal processing)
-            # Note: OpenAI SDK HTTP logging is always enabled at startup
-            self.langchain_debug = not self.langchain_debug
-
-            # Enable/disable LangChain's internal debug logging
-            langchain.debug = self.langchain_debug
-            langchain.verbose = self.langchain_debug
-
-            status = "enabled" if self.langchain_debug else "disabled"
-            self.logger.info(f"LangChain debug mode {status}")
-            if self.langchain_debug:
-                self.logger.info("Will show LangChain internal processing")
-            else:
-                self.logger.info("HTTP request logging still active (set at startup)")
-
-        elif cmd.startswith("/loglevel"):
-            # Change log level: /loglevel prompt INFO or /loglevel http DEBUG
-            parts = command.split()
-
-            # Show current status
-            if len(parts) == 1 or (len(parts) == 2 and parts[1].lower() == "status"):
-                print("\n=== Current Log Levels ===")
-                print(f"ROOT:      {logging.getLevelName(logging.getLogger().level)} (fixed at DEBUG)")
-                print(f"prompt:    {logging.getLevelName(self.prompt_logger.level)}")
-                print(f"http:      {logging.getLevelName(logging.getLogger('openai').level)}")
-                print(f"langchain: {logging.getLevelName(self.langchain_logger.level)}")
-                print("=========================\n")
-                print("Note: ROOT is fixed at DEBUG to allow category-level control")
-                return
+    def _cmd_clear(self, args: str) -> None:
+        """Clear conversation history."""
+        self.llm_service.clear_history(self.session_id)
+        self.logger.info("Conversation history cleared")
+
+    def _cmd_cache(self, args: str) -> None:
+        """Response cache control: /cache (status) or /cache clear."""
+        if args.lower() == "clear":
+            self.llm_service.clear_cache()
+            self.logger.info("Response cache cleared")
+        elif not args:
+            self.logger.info("Response cache: %d entries", len(self.llm_service.response_cache))
+        else:
+            print("Usage: /cache [clear]")
+
+    def _cmd_memory(self, args: str) -> None:
+        """Search conversation history: /memory search <query>."""
+        action, _, query = args.partition(" ")
+        query = query.strip()
+        if action.lower() != "search" or not query:
+            print("Usage: /memory search <query>")
+            return
+
+        results = self.llm_service.search_memory(self.session_id, query)
+        if not results:
+            self.logger.info("No matching messages")
+            return
+        labels = HISTORY_LABELS
+        rows = [f"{labels.get(msg['type'], msg['type'])}: {msg['content']}" for msg in results]
+        self.logger.info("=== Memory search ===\n%s", "\n".join(rows))
+
+    def _cmd_fullhistorylog(self, args: str) -> None:
+        """Toggle full history logging mode."""
+        self.log_full_history = not self.log_full_history
+        status = "enabled" if self.log_full_history else "disabled"
+        self.logger.info(f"Full history logging {status}")
+
+    def _cmd_debug(self, args: str) -> None:
+        """
+        Toggle LangChain debug mode (shows internal processing).
 
-            if len(parts) < 2 or len(parts) > 3:
-                print("Usage: /loglevel [category] [level]")
-                print("       /loglevel status  (show current levels)")
-                print("Categories: prompt, http, langchain, all")
-                print("Levels: DEBUG, INFO, WARNING, ERROR")
-                print("Example: /loglevel http DEBUG")
-                return
+        Uses a per-call callback handler instead of the process-wide
+        langchain.debug flag, so non-debug turns pay nothing.
+        """
+        self.langchain_debug = not self.langchain_debug
+
+        if self.langchain_debug and self.debug_callbacks is None:
+            # Deferred: only needed once debug mode is first enabled
+            from langchain_core.tracers.stdout import ConsoleCallbackHandler
+            self.debug_callbacks = [ConsoleCallbackHandler()]
+
+        status = "enabled" if self.langchain_debug else "disabled"
+        self.logger.info(f"LangChain debug mode {status}")
+        if self.langchain_debug:
+            self.logger.info("Will show LangChain internal processing")
+        elif self.http_loggers[0].isEnabledFor(logging.DEBUG):
+            self.logger.info("HTTP request logging still active (/loglevel http)")
+
+    def _cmd_loglevel(self, args: str) -> None:
+        """Change log level: /loglevel prompt INFO or /loglevel http DEBUG."""
+        parts = args.split()
+
+        # Show current status
+        if not parts or (len(parts) == 1 and parts[0].lower() == "status"):
+            # Emit the whole block in one write
+            print(
+                "\n=== Current Log Levels ===\n"
+                f"ROOT:      {format_level(logging.getLogger().level)} (fixed at DEBUG)\n"
+                f"prompt:    {format_level(self.prompt_logger.level)}\n"
+                f"http:      {format_level(self.http_loggers[0].level)}\n"
+                f"langchain: {format_level(self.langchain_logger.level)}\n"
+                "=========================\n\n"
+                "Note: ROOT is fixed at DEBUG to allow category-level control"
+            )
+            return
+
+        if len(parts) > 2:
+            print(LOGLEVEL_USAGE)
+            return
+
+        # Parse arguments
+        if len(parts) == 1:
+            category = "all"
+            level_name = parts[0].upper()
+        else:
+            category = parts[0].lower()
+            level_name = parts[1].upper()
 
-            # Parse arguments
-            if len(parts) == 2:
-                category = "all"
-                level_name = parts[1].upper()
-            else:
-                category = parts[1].lower()
-                level_name = parts[2].upper()
-
-            level_map = {
-                "DEBUG": logging.DEBUG,
-                "INFO": logging.INFO,
-                "WARNING": logging.WARNING,
-                "ERROR": logging.ERROR,
-            }
-
-            if level_name not in level_map:
-                self.logger.info(f"Invalid level: {level_name}. Use DEBUG, INFO, WARNING, or ERROR")
-                return
+        level = LOG_LEVELS.get(level_name)
+        if level is None:
+            self.logger.info("Invalid level: %s. Use DEBUG, INFO, WARNING, or ERROR", level_name)
+            return
 
-            level = level_map[level_name]
-
-            # Set log level for specified category
-            if category == "prompt":
-                self.prompt_logger.setLevel(level)
-                print(f"[Loglevel] Prompt logs set to {level_name}")
-            elif category == "http":
-                logging.getLogger("openai").setLevel(level)
-                logging.getLogger("httpx").setLevel(level)
-                logging.getLogger("httpcore").setLevel(level)
-                print(f"[Loglevel] HTTP logs set to {level_name}")
-            elif category == "langchain":
-                self.langchain_logger.setLevel(level)
-                print(f"[Loglevel] LangChain logs set to {level_name}")
-            elif category == "all":
-                self.prompt_logger.setLevel(level)
-                logging.getLogger("openai").setLevel(level)
-                logging.getLogger("httpx").setLevel(level)
-                logging.getLogger("httpcore").setLevel(level)
-                self.langchain_logger.setLevel(level)
-                print(f"[Loglevel] All categories set to {level_name}")
-            else:
-                print(f"[Loglevel] Unknown category: {category}. Use prompt, http, langchain, or all")
+        # Set log level for specified category
+        if category not in self.log_categories:
+            print(f"[Loglevel] Unknown category: {category}. Use prompt, http, langchain, or all")
+            return
 
-        else:
-            self.logger.info(f"Unknown command: {command}. Available: /history, /clear, /fullhistorylog, /debug, /loglevel")
+        label, loggers = self.log_categories[category]
+        for category_logger in loggers:
+            category_logger.setLevel(level)
+        print(f"[Loglevel] {label} set to {level_name}")
+
+    def _cmd_unknown(self, command: str) -> None:
+        """Report an unrecognized command and list the available ones."""
+        self.logger.info("Unknown command: %s. Available: %s", command, self._available_commands)
 
     def run(self) -> None:
-        """Run the REPL loop."""
-        print("CLI LLM PoC - Type your messages (Ctrl-C to exit)")
-        print("=" * 50)
+        """Run the REPL loop on an asyncio event loop."""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            # Ctrl-C while a response is streaming cancels the loop
+            pass
+
+        # Single exit path for Ctrl-C and EOF
+        self.shutdown()
+        sys.stdout.write(GOODBYE)
+        sys.stdout.flush()
+        sys.exit(0)
+
+    async def run_async(self) -> None:
+        """
+        Run the REPL loop, overlapping network I/O with the event loop.
+
+        Returns on Ctrl-C or end of input; exiting is left to run().
+        """
+        print(BANNER)
 
         # Log config on startup
-        config = self.llm_service.config_loader.get_config()
-        config_str = json.dumps(config, indent=2)
-        self.logger.info(f"Startup config:\n{config_str}")
+        config_str = self.llm_service.config_loader.get_config_json()
+        self.logger.info("Startup config:\n%s", config_str)
 
         while True:
             try:
                 # Check for hot reload before each turn
-                config_reloaded, template_reloaded = self.llm_service.check_hot_reload()
-
-                if config_reloaded or template_reloaded:
-                    reloaded_items = []
-                    if config_reloaded:
-                        reloaded_items.append("config")
-                    if template_reloaded:
-                        reloaded_items.append("template")
-                    print(f"[Config reloaded: {', '.join(reloaded_items)}]")
-
-                # Get user input
-                user_input = self.prompt_session.prompt("> ")
-
-                if not user_input.strip():
+                if self.reload_watcher is None:
+                    config_reloaded, template_reloaded = self.llm_service.check_hot_reload()
+                elif self.reload_watcher.consume():
+                    config_reloaded, template_reloaded = self.llm_service.check_hot_reload(force=True)
+                else:
+                    config_reloaded, template_reloaded = False, False
+
+                notice = RELOAD_NOTICES.get((config_reloaded, template_reloaded))
+                if notice:
+                    print(notice)
+
+                # Get user input (buffered log records first, so they precede the prompt)
+                flush_logs()
+                # Strip once; commands and the message both use the stripped text
+                user_input = (await self.read_input()).strip()
+
+                if not user_input:
                     continue
 
                 # Handle commands
@@ -254,29 +498,93 @@ class REPLCLI:
                     self.handle_command(user_input)
                     continue
 
-                # Send message and get response
+                # Send message and stream response as it arrives
                 try:
-                    response = self.llm_service.send_message(
-                        user_input=user_input,
-                        session_id=self.session_id,
-                        log_full_history=self.log_full_history
-                    )
-
-                    print(f"\n{response}\n")
+                    await self.stream_response(user_input)
 
                 except Exception as e:
-                    self.logger.error(f"Error calling API: {e}")
-                    print(f"Error calling API: {e}\n")
+                    self.logger.error("Error calling API: %s", e)
+                    print(f"\nError calling API: {e}\n")
 
-            except KeyboardInterrupt:
-                print("\n\nGoodbye!")
-                sys.exit(0)
-            except EOFError:
-                print("\n\nGoodbye!")
-                sys.exit(0)
+            except (KeyboardInterrupt, EOFError):
+                return
 
+    async def read_input(self) -> str:
+        """
+        Read the next line of user input.
 
-def run_repl(config_loader, prompt_builder, api_key):
+        Raises:
+            EOFError: At end of input
+        """
+        if self.prompt_session is not None:
+            if self.release_early_input is not None:
+                # prompt_toolkit takes over the terminal from here
+                self.release_early_input()
+                self.release_early_input = None
+            return await self.prompt_session.prompt_async("> ")
+
+        # Non-interactive: read on a worker thread so the event loop stays free
+        line = await asyncio.to_thread(sys.stdin.readline)
+        if not line:
+            raise EOFError
+        return line.rstrip("\n")
+
+    async def stream_response(self, user_input: str) -> None:
+        """Send a message and write the response to stdout as it streams in."""
+        leading = "\n"
+        refresh_interval = 1 / self.STREAM_REFRESH_PER_SECOND
+        last_flush = 0.0
+        loop = asyncio.get_running_loop()
+        # Trailing flush for text written since the last flush (None if none due)
+        pending_flush = None
+
+        def flush() -> None:
+            nonlocal last_flush, pending_flush
+            if pending_flush is not None:
+                pending_flush.cancel()
+                pending_flush = None
+            sys.stdout.flush()
+            last_flush = time.monotonic()
+
+        with block_buffered_stdout():
+            try:
+                async for chunk in self.llm_service.stream_message_async(
+                    user_input=user_input,
+                    session_id=self.session_id,
+                    log_full_history=self.log_full_history,
+                    callbacks=self.debug_callbacks if self.langchain_debug else None
+                ):
+                    # Fold the leading blank line into the first chunk's write,
+                    # after any buffered log records for this call
+                    if leading:
+                        flush_logs()
+                    sys.stdout.write(leading + chunk)
+                    leading = ""
+
+                    # Flush at a capped rate rather than on every token or
+                    # newline; text written inside the window is flushed when
+                    # it closes, even if no further chunk arrives
+                    elapsed = time.monotonic() - last_flush
+                    if elapsed >= refresh_interval:
+                        flush()
+                    elif pending_flush is None:
+                        pending_flush = loop.call_later(refresh_interval - elapsed, flush)
+                sys.stdout.write(leading + "\n\n")
+            finally:
+                # block_buffered_stdout flushes whatever is still buffered
+                if pending_flush is not None:
+                    pending_flush.cancel()
+
+    def shutdown(self) -> None:
+        """Stop background workers and close the session store before exit."""
+        if self.reload_watcher is not None:
+            self.reload_watcher.stop()
+        self.llm_service.session_memory.close()
+        if self.release_early_input is not None:
+            self.release_early_input()
+
+
+def run_repl(config_loader, prompt_builder, api_key, verbose_http=False):
     """
     Run the CLI REPL interface.
 
@@ -284,6 +592,7 @@ def run_repl(config_loader, prompt_builder, api_key):
         config_loader: ConfigLoader instance (for hot-reload)
         prompt_builder: PromptBuilder instance (for hot-reload)
         api_key: OpenRouter API key
+        verbose_http: Enable OpenAI SDK debug logging of raw HTTP requests/responses
     """
-    cli = REPLCLI(config_loader, prompt_builder, api_key)
+    cli = REPLCLI(config_loader, prompt_builder, api_key, verbose_http=verbose_http)
     cli.run()
@@ -3,7 +3,9 @@
 from .llm_service import LLMService, OpenRouterClient
 from .config_loader import ConfigLoader
 from .prompt_builder import PromptBuilder
-from .memory import SessionMemory, InMemoryChatHistory
+from .memory import SessionMemory, InMemoryChatHistory, SQLiteChatHistory
+from .cache import ResponseCache
+from .watcher import FileWatcher
 
 __all__ = [
     "LLMService",
@@ -12,4 +14,7 @@ __all__ = [
     "PromptBuilder",
     "SessionMemory",
     "InMemoryChatHistory",
+    "SQLiteChatHistory",
+    "ResponseCache",
+    "FileWatcher",
 ]
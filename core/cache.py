@@ -0,0 +1,54 @@
+import orjson
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import List, Dict, Optional
+
+
+class ResponseCache:
+    """LRU cache of model responses keyed by prompt content."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+
+    @staticmethod
+    def make_key(system_prompt: str, history: List[Dict[str, str]], user_input: str) -> bytes:
+        """
+        Build a 16-byte cache key for a turn.
+
+        Args:
+            system_prompt: Rendered system prompt
+            history: Conversation history as message dictionaries
+            user_input: Current user input
+
+        Returns:
+            blake2b digest of the system prompt, history and user input
+        """
+        digest = blake2b(digest_size=16)
+        parts = (system_prompt.encode("utf-8"), orjson.dumps(history), user_input.encode("utf-8"))
+        for data in parts:
+            # Length-prefix each part so boundaries can't be shifted between them
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Get a cached response and mark it as most recently used."""
+        response = self._entries.get(key)
+        if response is not None:
+            self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: bytes, response: str) -> None:
+        """Store a response, evicting the least recently used entry if full."""
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,19 +1,31 @@
-import os
+import time
+import orjson
 import yaml
 import logging
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+# libyaml-backed loader when PyYAML was built with it (much faster to parse)
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 logger = logging.getLogger(__name__)
 
 
 class ConfigLoader:
     """Loads and tracks configuration file with hot reload support."""
 
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: str, check_interval: float = 1.0):
         self.config_path = Path(config_path)
         self.config: Optional[Dict[str, Any]] = None
+        self.previous_config: Optional[Dict[str, Any]] = None
         self.last_mtime: Optional[float] = None
+        self._config_json: Optional[str] = None
+        # Minimum seconds between mtime checks in check_and_reload
+        self.check_interval = check_interval
+        self._last_check: Optional[float] = None
 
     def load(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
@@ -21,7 +33,7 @@ class ConfigLoader:
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
 
         with open(self.config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
 
         # Validate required fields
         required_fields = ['model', 'temperature', 'max_tokens']
@@ -29,21 +41,33 @@ class ConfigLoader:
             if field not in config:
                 raise ValueError(f"Missing required config field: {field}")
 
+        self.previous_config = self.config
         self.config = config
         self.last_mtime = self.config_path.stat().st_mtime
+        self._config_json = None
         return config
 
-    def check_and_reload(self) -> tuple[bool, Optional[Dict[str, Any]]]:
+    def check_and_reload(self, force: bool = False) -> tuple[bool, Optional[Dict[str, Any]]]:
         """
         Check if config file has been modified and reload if necessary.
 
+        Args:
+            force: Check the mtime even if the file was checked recently
+
         Returns:
             Tuple of (was_reloaded: bool, config: Optional[Dict])
         """
-        if not self.config_path.exists():
+        # Skip the stat() if the file was checked recently
+        now = time.monotonic()
+        if (not force and self._last_check is not None
+                and now - self._last_check < self.check_interval):
             return False, self.config
+        self._last_check = now
 
-        current_mtime = self.config_path.stat().st_mtime
+        try:
+            current_mtime = self.config_path.stat().st_mtime
+        except FileNotFoundError:
+            return False, self.config
 
         # First load or file has been modified
         if self.last_mtime is None or current_mtime > self.last_mtime:
@@ -61,3 +85,29 @@ class ConfigLoader:
         if self.config is None:
             self.load()
         return self.config
+
+    def get_changes(self) -> Dict[str, tuple[Any, Any]]:
+        """
+        Get the values changed by the most recent load.
+
+        Returns:
+            Mapping of changed key to (old value, new value); missing keys
+            are reported as None. Empty on first load.
+        """
+        if self.previous_config is None or self.config is None:
+            return {}
+        old, new = self.previous_config, self.config
+        return {
+            key: (old.get(key), new.get(key))
+            for key in old.keys() | new.keys()
+            if old.get(key) != new.get(key)
+        }
+
+    def get_config_json(self) -> str:
+        """Get current configuration formatted as indented JSON (cached until reload)."""
+        if self._config_json is None:
+            self._config_json = orjson.dumps(
+                self.get_config(),
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode()
+        return self._config_json
@@ -8,14 +8,85 @@ This module contains the business logic for:
 - Config and template rendering
 """
 
-import os
-import sys
+import asyncio
 import logging
-import json
-from pathlib import Path
-from typing import List, Dict, Any, Optional
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
+import orjson
+from functools import partial
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator, Callable
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage, ToolMessage
+
+from .cache import ResponseCache
+from .memory import get_encoding, plan_compaction, summarize_if_needed, summary_message
+
+# Instruction used when folding old turns into a summary
+SUMMARY_PROMPT = (
+    "Summarize the following conversation concisely. Preserve names, entities, "
+    "facts, decisions and open questions needed to continue it."
+)
+
+# Config keys consumed by the service rather than passed to the API
+SERVICE_CONFIG_KEYS = frozenset({
+    "system_prompt", "model", "summary_model", "max_history_tokens", "memory_mode",
+    "cache_enabled",
+})
+
+# Tool offered to the model when memory_mode is "tool"
+SEARCH_MEMORY_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "search_memory",
+        "description": (
+            "Search earlier messages of this conversation. Use it whenever the "
+            "user refers to something said before."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Keywords to search for"},
+            },
+            "required": ["query"],
+        },
+    },
+}
+
+# Maximum model round trips spent on tool calls in a single turn
+MAX_TOOL_ROUNDS = 3
+
+# OpenAI-style role names by message class, for API-call logs
+MESSAGE_ROLES = {
+    SystemMessage: "system",
+    HumanMessage: "user",
+    AIMessage: "assistant",
+}
+
+# Maximum number of distinct ChatOpenAI clients kept by OpenRouterClient
+MAX_CACHED_CLIENTS = 8
+
+# Number of most recent history messages that make up a response cache key
+CACHE_CONTEXT_MESSAGES = 6
+
+# Default maximum number of requests send_messages_batch has in flight
+BATCH_CONCURRENCY = 4
+
+# Maximum characters of a string value shown when logging a changed config key
+CHANGE_PREVIEW_CHARS = 80
+
+
+def preview_value(value: Any, limit: int = CHANGE_PREVIEW_CHARS) -> str:
+    """
+    Format a value for a log line, truncating long strings before repr().
+
+    Args:
+        value: Value to format
+        limit: Maximum number of characters of a string value to keep
+
+    Returns:
+        repr() of the value, with "..." appended if a string was cut short
+    """
+    if isinstance(value, str) and len(value) > limit:
+        return f"{value[:limit]!r}..."
+    return repr(value)
 
 
 class OpenRouterClient:
@@ -24,7 +95,54 @@ class OpenRouterClient:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://openrouter.ai/api/v1"
-        self.client = None  # Will be initialized per request with model config
+        # ChatOpenAI instances by (model, serialized parameters), reused across calls
+        self._clients: Dict[tuple, Any] = {}
+
+    def _get_client(self, model: str, kwargs: Dict[str, Any]) -> tuple[Any, Optional[Dict[str, Any]]]:
+        """
+        Get a cached ChatOpenAI client for a model and parameter set.
+
+        Callbacks are per call, so they are split off into a run config
+        instead of being baked into the cached client.
+
+        Args:
+            model: Model identifier
+            kwargs: API parameters (a "callbacks" entry is removed)
+
+        Returns:
+            Tuple of (client, run config for invoke/stream or None)
+        """
+        callbacks = kwargs.pop("callbacks", None)
+        key = (model, orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS, default=str))
+        client = self._clients.get(key)
+        if client is None:
+            # Deferred: langchain_openai pulls in the whole OpenAI SDK at import
+            from langchain_openai import ChatOpenAI
+
+            # Parameter sets only accumulate across config edits; start over
+            if len(self._clients) >= MAX_CACHED_CLIENTS:
+                self._clients.clear()
+            client = ChatOpenAI(
+                base_url=self.base_url,
+                api_key=self.api_key,
+                model=model,
+                **kwargs
+            )
+            self._clients[key] = client
+        return client, {"callbacks": callbacks} if callbacks else None
+
+    def warm_up(self, model: str, **kwargs) -> None:
+        """
+        Build (and cache) the client for a model ahead of the first request.
+
+        Pays the one-off import and HTTP client setup cost (around a second)
+        up front. Makes no network calls.
+
+        Args:
+            model: Model identifier
+            **kwargs: API parameters the first request will use
+        """
+        self._get_client(model, kwargs)
 
     def chat_completion(self, model: str, messages: List[BaseMessage], **kwargs) -> str:
         """
@@ -41,19 +159,259 @@ class OpenRouterClient:
         Raises:
             Exception: On API errors
         """
-        # Initialize ChatOpenAI with current config
-        client = ChatOpenAI(
-            base_url=self.base_url,
-            api_key=self.api_key,
-            model=model,
-            **kwargs
-        )
+        client, config = self._get_client(model, kwargs)
 
         # Invoke the model
-        response = client.invoke(messages)
+        response = client.invoke(messages, config=config)
+
+        return response.content
+
+    def stream_chat_completion(
+        self, model: str, messages: List[BaseMessage], **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream chat completion from OpenRouter via LangChain.
+
+        Args:
+            model: Model identifier (e.g., anthropic/claude-3.5-sonnet)
+            messages: List of LangChain message objects
+            **kwargs: Additional API parameters (temperature, max_tokens, etc.)
+
+        Yields:
+            Response content chunks as they arrive
+
+        Raises:
+            Exception: On API errors
+        """
+        client, config = self._get_client(model, kwargs)
+
+        for chunk in client.stream(messages, config=config):
+            if chunk.content:
+                yield chunk.content
+
+    async def achat_completion(self, model: str, messages: List[BaseMessage], **kwargs) -> str:
+        """
+        Async variant of chat_completion.
+
+        Args:
+            model: Model identifier (e.g., anthropic/claude-3.5-sonnet)
+            messages: List of LangChain message objects
+            **kwargs: Additional API parameters (temperature, max_tokens, etc.)
+
+        Returns:
+            Response content from the model
+
+        Raises:
+            Exception: On API errors
+        """
+        client, config = self._get_client(model, kwargs)
+
+        response = await client.ainvoke(messages, config=config)
+
+        return response.content
+
+    async def astream_chat_completion(
+        self, model: str, messages: List[BaseMessage], **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of stream_chat_completion.
+
+        Args:
+            model: Model identifier (e.g., anthropic/claude-3.5-sonnet)
+            messages: List of LangChain message objects
+            **kwargs: Additional API parameters (temperature, max_tokens, etc.)
+
+        Yields:
+            Response content chunks as they arrive
+
+        Raises:
+            Exception: On API errors
+        """
+        client, config = self._get_client(model, kwargs)
+
+        async for chunk in client.astream(messages, config=config):
+            if chunk.content:
+                yield chunk.content
+
+    def chat_completion_with_tools(
+        self,
+        model: str,
+        messages: List[BaseMessage],
+        tools: List[Dict[str, Any]],
+        run_tool: Callable[[str, Dict[str, Any]], str],
+        **kwargs
+    ) -> str:
+        """
+        Send chat completion request, running tool calls until the model answers.
+
+        Args:
+            model: Model identifier (e.g., anthropic/claude-3.5-sonnet)
+            messages: List of LangChain message objects
+            tools: OpenAI-format tool schemas offered to the model
+            run_tool: Callable taking (tool_name, arguments) and returning the result text
+            **kwargs: Additional API parameters (temperature, max_tokens, etc.)
+
+        Returns:
+            Final response content from the model
+
+        Raises:
+            Exception: On API errors
+        """
+        client, config = self._get_client(model, kwargs)
+        bound = client.bind_tools(tools)
+
+        messages = list(messages)
+        for _ in range(MAX_TOOL_ROUNDS):
+            response = bound.invoke(messages, config=config)
+            if not response.tool_calls:
+                return response.content
+            messages.append(response)
+            messages.extend(self._run_tool_calls(response, run_tool))
+
+        # Out of tool rounds: require a final answer
+        return client.bind_tools(tools, tool_choice="none").invoke(messages, config=config).content
+
+    async def achat_completion_with_tools(
+        self,
+        model: str,
+        messages: List[BaseMessage],
+        tools: List[Dict[str, Any]],
+        run_tool: Callable[[str, Dict[str, Any]], str],
+        **kwargs
+    ) -> str:
+        """
+        Async variant of chat_completion_with_tools.
+
+        Args:
+            model: Model identifier (e.g., anthropic/claude-3.5-sonnet)
+            messages: List of LangChain message objects
+            tools: OpenAI-format tool schemas offered to the model
+            run_tool: Callable taking (tool_name, arguments) and returning the result text
+            **kwargs: Additional API parameters (temperature, max_tokens, etc.)
 
+        Returns:
+            Final response content from the model
+
+        Raises:
+            Exception: On API errors
+        """
+        client, config = self._get_client(model, kwargs)
+        bound = client.bind_tools(tools)
+
+        messages = list(messages)
+        for _ in range(MAX_TOOL_ROUNDS):
+            response = await bound.ainvoke(messages, config=config)
+            if not response.tool_calls:
+                return response.content
+            messages.append(response)
+            messages.extend(self._run_tool_calls(response, run_tool))
+
+        # Out of tool rounds: require a final answer
+        response = await client.bind_tools(tools, tool_choice="none").ainvoke(messages, config=config)
         return response.content
 
+    def stream_chat_completion_with_tools(
+        self,
+        model: str,
+        messages: List[BaseMessage],
+        tools: List[Dict[str, Any]],
+        run_tool: Callable[[str, Dict[str, Any]], str],
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream chat completion, running tool calls until the model answers.
+
+        Each round is streamed; text is yielded as it arrives while tool-call
+        chunks are gathered and run once the round completes.
+
+        Args:
+            model: Model identifier (e.g., anthropic/claude-3.5-sonnet)
+            messages: List of LangChain message objects
+            tools: OpenAI-format tool schemas offered to the model
+            run_tool: Callable taking (tool_name, arguments) and returning the result text
+            **kwargs: Additional API parameters (temperature, max_tokens, etc.)
+
+        Yields:
+            Response content chunks as they arrive
+
+        Raises:
+            Exception: On API errors
+        """
+        client, config = self._get_client(model, kwargs)
+        bound = client.bind_tools(tools)
+
+        messages = list(messages)
+        for _ in range(MAX_TOOL_ROUNDS):
+            gathered = None
+            for chunk in bound.stream(messages, config=config):
+                if chunk.content:
+                    yield chunk.content
+                gathered = chunk if gathered is None else gathered + chunk
+            if gathered is None or not gathered.tool_calls:
+                return
+            messages.append(gathered)
+            messages.extend(self._run_tool_calls(gathered, run_tool))
+
+        # Out of tool rounds: require a final answer
+        for chunk in client.bind_tools(tools, tool_choice="none").stream(messages, config=config):
+            if chunk.content:
+                yield chunk.content
+
+    async def astream_chat_completion_with_tools(
+        self,
+        model: str,
+        messages: List[BaseMessage],
+        tools: List[Dict[str, Any]],
+        run_tool: Callable[[str, Dict[str, Any]], str],
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of stream_chat_completion_with_tools.
+
+        Args:
+            model: Model identifier (e.g., anthropic/claude-3.5-sonnet)
+            messages: List of LangChain message objects
+            tools: OpenAI-format tool schemas offered to the model
+            run_tool: Callable taking (tool_name, arguments) and returning the result text
+            **kwargs: Additional API parameters (temperature, max_tokens, etc.)
+
+        Yields:
+            Response content chunks as they arrive
+
+        Raises:
+            Exception: On API errors
+        """
+        client, config = self._get_client(model, kwargs)
+        bound = client.bind_tools(tools)
+
+        messages = list(messages)
+        for _ in range(MAX_TOOL_ROUNDS):
+            gathered = None
+            async for chunk in bound.astream(messages, config=config):
+                if chunk.content:
+                    yield chunk.content
+                gathered = chunk if gathered is None else gathered + chunk
+            if gathered is None or not gathered.tool_calls:
+                return
+            messages.append(gathered)
+            messages.extend(self._run_tool_calls(gathered, run_tool))
+
+        # Out of tool rounds: require a final answer
+        async for chunk in client.bind_tools(tools, tool_choice="none").astream(messages, config=config):
+            if chunk.content:
+                yield chunk.content
+
+    @staticmethod
+    def _run_tool_calls(
+        response: AIMessage,
+        run_tool: Callable[[str, Dict[str, Any]], str]
+    ) -> List[ToolMessage]:
+        """Run each tool call in a response and wrap the results as tool messages."""
+        return [
+            ToolMessage(content=run_tool(call["name"], call["args"]), tool_call_id=call["id"])
+            for call in response.tool_calls
+        ]
+
 
 class LLMService:
     """
@@ -63,7 +421,11 @@ class LLMService:
     - Message construction with history
     - Template rendering
     - API calls
+    - Response caching
     - Session memory management
+
+    Log calls on the per-turn path use lazy %-style arguments, and any log
+    payload that is costly to build is guarded with logger.isEnabledFor().
     """
 
     def __init__(
@@ -73,6 +435,7 @@ class LLMService:
         session_memory,
         api_key: str,
         logger: Optional[logging.Logger] = None,
+        response_cache: Optional[ResponseCache] = None,
     ):
         """
         Initialize LLM service.
@@ -83,31 +446,77 @@ class LLMService:
             session_memory: SessionMemory instance
             api_key: OpenRouter API key
             logger: Optional logger instance
+            response_cache: Optional ResponseCache instance
         """
         self.config_loader = config_loader
         self.prompt_builder = prompt_builder
         self.session_memory = session_memory
         self.client = OpenRouterClient(api_key)
+        self.response_cache = response_cache or ResponseCache()
         # Use app.prompt logger category for prompt/config logging
         self.logger = logger or logging.getLogger("app.prompt")
+        # Rendered system prompt, kept byte-identical across turns so the
+        # provider's prompt cache can reuse the prefix (None = not rendered)
+        self._system_prompt: Optional[str] = None
+        # (model, kwargs) derived from config, rebuilt after a config reload
+        self._api_params: Optional[tuple[str, Dict[str, Any]]] = None
 
-    def check_hot_reload(self) -> tuple[bool, bool]:
+    def check_hot_reload(self, force: bool = False) -> tuple[bool, bool]:
         """
         Check and reload config/template if modified.
 
+        Args:
+            force: Check mtimes even if the files were checked recently
+
         Returns:
             Tuple of (config_reloaded, template_reloaded)
         """
-        config_reloaded, _ = self.config_loader.check_and_reload()
-        template_reloaded, _ = self.prompt_builder.check_and_reload()
+        config_reloaded, _ = self.config_loader.check_and_reload(force)
+        template_reloaded, _ = self.prompt_builder.check_and_reload(force)
 
         if config_reloaded:
-            config = self.config_loader.get_config()
-            config_str = json.dumps(config, indent=2)
-            self.logger.info(f"Config reloaded:\n{config_str}")
+            # Log only what changed; the full config is a DEBUG-level detail
+            changes = self.config_loader.get_changes()
+            if changes:
+                self.logger.info("Config reloaded: %s", ", ".join(
+                    f"{key}: {preview_value(old)} -> {preview_value(new)}"
+                    for key, (old, new) in sorted(changes.items())
+                ))
+                # Model parameters changed, so cached responses are stale
+                self.response_cache.clear()
+            else:
+                self.logger.info("Config reloaded: no changes")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Config:\n%s", self.config_loader.get_config_json())
+            self._api_params = None
+
+        if config_reloaded or template_reloaded:
+            previous = self._system_prompt
+            self._system_prompt = None
+            if previous is not None and self.get_system_prompt() != previous:
+                self.logger.info("System prompt changed; prompt cache prefix will be rebuilt")
 
         return config_reloaded, template_reloaded
 
+    def get_system_prompt(self) -> str:
+        """
+        Get the rendered system prompt.
+
+        The prompt is rendered from config only (not the user input) and
+        cached until the next config/template reload, so every turn sends
+        the same static prefix.
+
+        Returns:
+            Rendered system prompt, or empty string if none is configured
+        """
+        if self._system_prompt is None:
+            config = self.config_loader.get_config()
+            if config.get("system_prompt", ""):
+                self._system_prompt = self.prompt_builder.render(config=config)
+            else:
+                self._system_prompt = ""
+        return self._system_prompt
+
     def build_messages(self, user_input: str, session_id: str) -> List[BaseMessage]:
         """
         Build messages list including system prompt and conversation history.
@@ -119,21 +528,18 @@ class LLMService:
         Returns:
             List of LangChain message objects
         """
-        config = self.config_loader.get_config()
         messages = []
 
-        # Add system prompt if configured
-        system_prompt = config.get("system_prompt", "")
+        # Add static system prompt first so the prefix is stable across turns
+        system_prompt = self.get_system_prompt()
         if system_prompt:
-            rendered_system = self.prompt_builder.render(
-                user_input=user_input,
-                config=config
-            )
-            messages.append(SystemMessage(content=rendered_system))
+            messages.append(SystemMessage(content=system_prompt))
 
         # Add conversation history (LangChain messages are already in correct format)
-        history = self.session_memory.get_session(session_id)
-        messages.extend(history.messages_list)
+        # In memory tool mode the model retrieves history via search_memory instead
+        if not self.uses_memory_tool():
+            history = self.session_memory.get_session(session_id)
+            messages.extend(history.messages_list)
 
         # Add current user input
         messages.append(HumanMessage(content=user_input))
@@ -144,44 +550,45 @@ class LLMService:
         """
         Build API call parameters from config.
 
+        The parameters are derived once per config reload; each call gets
+        its own copy of kwargs so callers can add per-call entries.
+
         Returns:
             Tuple of (model, kwargs) where kwargs are additional API parameters
         """
-        config = self.config_loader.get_config()
+        if self._api_params is None:
+            config = self.config_loader.get_config()
 
-        # Extract model separately
-        model = config["model"]
+            # Extract model separately
+            model = config["model"]
 
-        # Build kwargs for ChatOpenAI from config
-        # Skip non-API params like system_prompt and model
-        skip_keys = {"system_prompt", "model"}
-        kwargs = {}
-        for key, value in config.items():
-            if key not in skip_keys:
-                kwargs[key] = value
+            # Build kwargs for ChatOpenAI from config
+            # Skip non-API params like system_prompt and model
+            kwargs = {
+                key: value for key, value in config.items()
+                if key not in SERVICE_CONFIG_KEYS
+            }
+            self._api_params = (model, kwargs)
 
-        return model, kwargs
+        model, kwargs = self._api_params
+        return model, dict(kwargs)
 
     def _messages_to_dict(self, messages: List[BaseMessage]) -> List[Dict[str, str]]:
         """Convert LangChain messages to dict format for logging."""
-        result = []
-        for msg in messages:
-            if isinstance(msg, SystemMessage):
-                result.append({"role": "system", "content": msg.content})
-            elif isinstance(msg, HumanMessage):
-                result.append({"role": "user", "content": msg.content})
-            elif isinstance(msg, AIMessage):
-                result.append({"role": "assistant", "content": msg.content})
-        return result
+        roles = MESSAGE_ROLES
+        return [
+            {"role": roles.get(type(msg), msg.type), "content": msg.content}
+            for msg in messages
+        ]
 
-    def send_message(
+    def _prepare_call(
         self,
         user_input: str,
         session_id: str,
-        log_full_history: bool = False
-    ) -> str:
+        log_full_history: bool
+    ) -> tuple[List[BaseMessage], str, Dict[str, Any]]:
         """
-        Send a message and get response.
+        Build messages and API parameters for a turn and log the call.
 
         Args:
             user_input: User's message
@@ -189,7 +596,7 @@ class LLMService:
             log_full_history: Whether to log full conversation history
 
         Returns:
-            Model's response
+            Tuple of (messages, model, kwargs)
         """
         # Build messages with history
         messages = self.build_messages(user_input, session_id)
@@ -198,6 +605,23 @@ class LLMService:
         model, kwargs = self.build_api_params()
 
         # Log inference call details
+        self._log_api_call(messages, model, kwargs, user_input, log_full_history)
+
+        return messages, model, kwargs
+
+    def _log_api_call(
+        self,
+        messages: List[BaseMessage],
+        model: str,
+        kwargs: Dict[str, Any],
+        user_input: str,
+        log_full_history: bool
+    ) -> None:
+        """Log the request about to be sent (full history or current turn only)."""
+        # Skip building the payload entirely if the prompt log is filtered out
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         if log_full_history:
             # Log complete API call with all parameters and full history
             messages_dict = self._messages_to_dict(messages)
@@ -206,21 +630,14 @@ class LLMService:
                 **kwargs,
                 "messages": messages_dict
             }
-            api_call_str = json.dumps(api_call, indent=2)
-            self.logger.info(f"API call (full with history):\n{api_call_str}")
+            api_call_str = orjson.dumps(api_call, option=orjson.OPT_INDENT_2).decode()
+            self.logger.info("API call (full with history):\n%s", api_call_str)
         else:
             # Log only current turn's constructed prompt
             config = self.config_loader.get_config()
-            current_turn = []
 
-            # Add system prompt if configured
-            system_prompt = config.get("system_prompt", "")
-            if system_prompt:
-                rendered_system = self.prompt_builder.render(
-                    user_input=user_input,
-                    config=config
-                )
-                current_turn.append(SystemMessage(content=rendered_system))
+            # Reuse the system message already built for this call (if configured)
+            current_turn = messages[:1] if self.get_system_prompt() else []
 
             # Add current user input (allow template injection)
             rendered_user = self.prompt_builder.render_user(
@@ -236,25 +653,448 @@ class LLMService:
                 **kwargs,
                 "messages": current_turn_dict
             }
-            api_call_str = json.dumps(api_call, indent=2)
-            self.logger.info(f"API call (current turn):\n{api_call_str}")
+            api_call_str = orjson.dumps(api_call, option=orjson.OPT_INDENT_2).decode()
+            self.logger.info("API call (current turn):\n%s", api_call_str)
 
-        # Call API
-        response = self.client.chat_completion(model=model, messages=messages, **kwargs)
+    def warm_up(self) -> None:
+        """
+        Prepare the API client and tokenizer ahead of the first request.
+
+        Safe to run on a thread. Loading the tokenizer may download its
+        encoding data, which is paid here rather than on the first turn.
+        """
+        try:
+            model, kwargs = self.build_api_params()
+            self.client.warm_up(model, **kwargs)
+            if not self.uses_memory_tool():
+                # Used to size history for compaction (not done in tool mode)
+                get_encoding(self.config_loader.get_config()["model"])
+        except Exception as e:
+            # The first request will surface any real problem
+            self.logger.debug("Warm-up failed: %s", e)
+
+    def uses_memory_tool(self) -> bool:
+        """Whether history is retrieved through the search_memory tool instead of the prompt."""
+        return self.config_loader.get_config().get("memory_mode", "history") == "tool"
+
+    def search_memory(self, session_id: str, query: str, limit: int = 5) -> List[Dict[str, str]]:
+        """
+        Search a session's conversation history.
+
+        Args:
+            session_id: Session identifier
+            query: Search terms
+            limit: Maximum number of messages to return
+
+        Returns:
+            List of message dictionaries with 'type' and 'content', best match first
+        """
+        history = self.session_memory.get_session(session_id)
+        return [
+            {"type": msg.type, "content": msg.content}
+            for msg in history.search(query, limit)
+        ]
+
+    def _run_tool(self, session_id: str, name: str, args: Dict[str, Any]) -> str:
+        """Run a tool call requested by the model."""
+        if name != "search_memory":
+            return f"Unknown tool: {name}"
+
+        results = self.search_memory(session_id, args.get("query", ""))
+        self.logger.info("Memory search %r: %d results", args.get("query", ""), len(results))
+        if not results:
+            return "No matching messages found."
+        return "\n".join(f"{msg['type']}: {msg['content']}" for msg in results)
+
+    def _summary_request(self, messages: List[BaseMessage]) -> tuple[str, List[BaseMessage]]:
+        """Build the (model, messages) request that summarizes messages."""
+        config = self.config_loader.get_config()
+        model = config.get("summary_model", config["model"])
+        transcript = "\n".join(f"{msg.type}: {msg.content}" for msg in messages)
+        return model, [SystemMessage(content=SUMMARY_PROMPT), HumanMessage(content=transcript)]
+
+    def _summarize(self, messages: List[BaseMessage]) -> str:
+        """Summarize messages with the configured summary model."""
+        model, request = self._summary_request(messages)
+        return self.client.chat_completion(model=model, messages=request, temperature=0)
+
+    async def _asummarize(self, messages: List[BaseMessage]) -> str:
+        """Async variant of _summarize."""
+        model, request = self._summary_request(messages)
+        return await self.client.achat_completion(model=model, messages=request, temperature=0)
+
+    def compact_history(self, session_id: str) -> bool:
+        """
+        Summarize old turns if the session history exceeds its token budget.
+
+        The budget is the `max_history_tokens` config value (default 6000).
+        Summarization errors are logged and leave the history unchanged.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            True if the history was compacted
+        """
+        config = self.config_loader.get_config()
+        history = self.session_memory.get_session(session_id)
+        try:
+            compacted = summarize_if_needed(
+                history,
+                self._summarize,
+                max_tokens=config.get("max_history_tokens", 6000),
+                model=config["model"]
+            )
+        except Exception as e:
+            self.logger.error("Error summarizing history: %s", e)
+            return False
+
+        if compacted:
+            self.logger.info("History compacted to %d messages", len(history))
+        return compacted
+
+    async def acompact_history(self, session_id: str) -> bool:
+        """
+        Async variant of compact_history.
+
+        Token counting runs on a worker thread and the summary request is
+        awaited, so the event loop keeps running throughout. The result is
+        discarded if the history changed in the meantime.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            True if the history was compacted
+        """
+        config = self.config_loader.get_config()
+        history = self.session_memory.get_session(session_id)
+        try:
+            # Token counting may load (or download) the tokenizer; it only
+            # reads the message list, so it can run on a worker thread
+            count = await asyncio.to_thread(
+                plan_compaction,
+                history,
+                max_tokens=config.get("max_history_tokens", 6000),
+                model=config["model"]
+            )
+            if not count:
+                return False
+            revision = history.revision
+            summary = await self._asummarize(history.messages_list[:count])
+        except Exception as e:
+            self.logger.error("Error summarizing history: %s", e)
+            return False
+
+        if history.revision != revision:
+            self.logger.info("History changed while summarizing; compaction skipped")
+            return False
+        history.compact(count, summary_message(summary))
+        self.logger.info("History compacted to %d messages", len(history))
+        return True
+
+    def _cache_key(self, user_input: str, session_id: str) -> bytes:
+        """
+        Build the response cache key for a turn.
+
+        The key covers the system prompt, the most recent history messages
+        and the user input with case and whitespace normalized, so a repeated
+        question hits the cache regardless of older turns or trivial typing
+        differences.
+        """
+        return self.response_cache.make_key(
+            self.get_system_prompt(),
+            self.get_history(session_id, limit=CACHE_CONTEXT_MESSAGES),
+            " ".join(user_input.split()).lower()
+        )
 
-        # Save to memory
+    def _save_turn(self, user_input: str, response: str, session_id: str) -> None:
+        """Save a completed user/assistant exchange to session memory."""
         history = self.session_memory.get_session(session_id)
-        history.add_message(HumanMessage(content=user_input))
-        history.add_message(AIMessage(content=response))
+        history.add_messages([HumanMessage(content=user_input), AIMessage(content=response)])
+
+    def _begin_turn(self, user_input: str, session_id: str) -> tuple[Optional[bytes], Optional[str]]:
+        """
+        Prepare session state for a turn and look up a cached response.
+
+        Args:
+            user_input: User's message
+            session_id: Session identifier
+
+        Returns:
+            Tuple of (cache_key, cached_response or None); cache_key is None
+            when the response cache is disabled in config
+        """
+        # Keep history within its token budget before building the prompt
+        # (not needed when history is searched rather than sent)
+        if not self.uses_memory_tool():
+            self.compact_history(session_id)
+        return self._lookup_response(user_input, session_id)
+
+    async def _abegin_turn(self, user_input: str, session_id: str) -> tuple[Optional[bytes], Optional[str]]:
+        """Async variant of _begin_turn (compaction does not block the event loop)."""
+        if not self.uses_memory_tool():
+            await self.acompact_history(session_id)
+        return self._lookup_response(user_input, session_id)
+
+    def _lookup_response(self, user_input: str, session_id: str) -> tuple[Optional[bytes], Optional[str]]:
+        """
+        Look up a cached response for a turn.
+
+        Args:
+            user_input: User's message
+            session_id: Session identifier
+
+        Returns:
+            Tuple of (cache_key, cached_response or None); cache_key is None
+            when the response cache is disabled in config
+        """
+        if not self.config_loader.get_config().get("cache_enabled", True):
+            return None, None
+
+        # Look up a cached response for an exact repeat of this turn
+        cache_key = self._cache_key(user_input, session_id)
+        response = self.response_cache.get(cache_key)
+        if response is not None:
+            self.logger.info("Response cache hit, skipping API call")
+        return cache_key, response
+
+    def _finish_turn(
+        self,
+        cache_key: Optional[bytes],
+        user_input: str,
+        response: str,
+        session_id: str
+    ) -> None:
+        """Cache a fresh response (if caching is enabled) and save the exchange to memory."""
+        if cache_key is not None:
+            self.response_cache.put(cache_key, response)
+        self._save_turn(user_input, response, session_id)
+
+    def send_message(
+        self,
+        user_input: str,
+        session_id: str,
+        log_full_history: bool = False,
+        callbacks: Optional[List[BaseCallbackHandler]] = None
+    ) -> str:
+        """
+        Send a message and get response.
+
+        Args:
+            user_input: User's message
+            session_id: Session identifier
+            log_full_history: Whether to log full conversation history
+            callbacks: Optional LangChain callback handlers for this call
+
+        Returns:
+            Model's response
+        """
+        cache_key, response = self._begin_turn(user_input, session_id)
+        if response is not None:
+            self._save_turn(user_input, response, session_id)
+            return response
+
+        messages, model, kwargs = self._prepare_call(user_input, session_id, log_full_history)
+        if callbacks:
+            kwargs["callbacks"] = callbacks
+
+        # Call API
+        if self.uses_memory_tool():
+            response = self.client.chat_completion_with_tools(
+                model, messages, [SEARCH_MEMORY_TOOL], partial(self._run_tool, session_id), **kwargs
+            )
+        else:
+            response = self.client.chat_completion(model=model, messages=messages, **kwargs)
+
+        self._finish_turn(cache_key, user_input, response, session_id)
+        return response
+
+    def stream_message(
+        self,
+        user_input: str,
+        session_id: str,
+        log_full_history: bool = False,
+        callbacks: Optional[List[BaseCallbackHandler]] = None
+    ) -> Iterator[str]:
+        """
+        Send a message and stream the response.
+
+        The exchange is saved to session memory only once the stream has
+        been fully consumed.
+
+        Args:
+            user_input: User's message
+            session_id: Session identifier
+            log_full_history: Whether to log full conversation history
+            callbacks: Optional LangChain callback handlers for this call
+
+        Yields:
+            Response content chunks as they arrive
+        """
+        cache_key, response = self._begin_turn(user_input, session_id)
+        if response is not None:
+            yield response
+            self._save_turn(user_input, response, session_id)
+            return
+
+        messages, model, kwargs = self._prepare_call(user_input, session_id, log_full_history)
+        if callbacks:
+            kwargs["callbacks"] = callbacks
+
+        if self.uses_memory_tool():
+            stream = self.client.stream_chat_completion_with_tools(
+                model, messages, [SEARCH_MEMORY_TOOL], partial(self._run_tool, session_id), **kwargs
+            )
+        else:
+            stream = self.client.stream_chat_completion(model=model, messages=messages, **kwargs)
+
+        # Call API, yielding chunks while collecting the full response
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+
+        self._finish_turn(cache_key, user_input, "".join(chunks), session_id)
+
+    async def send_message_async(
+        self,
+        user_input: str,
+        session_id: str,
+        log_full_history: bool = False,
+        callbacks: Optional[List[BaseCallbackHandler]] = None
+    ) -> str:
+        """
+        Async variant of send_message.
+
+        Args:
+            user_input: User's message
+            session_id: Session identifier
+            log_full_history: Whether to log full conversation history
+            callbacks: Optional LangChain callback handlers for this call
 
+        Returns:
+            Model's response
+        """
+        cache_key, response = await self._abegin_turn(user_input, session_id)
+        if response is not None:
+            self._save_turn(user_input, response, session_id)
+            return response
+
+        messages, model, kwargs = self._prepare_call(user_input, session_id, log_full_history)
+        if callbacks:
+            kwargs["callbacks"] = callbacks
+
+        # Call API without blocking the event loop
+        if self.uses_memory_tool():
+            response = await self.client.achat_completion_with_tools(
+                model, messages, [SEARCH_MEMORY_TOOL], partial(self._run_tool, session_id), **kwargs
+            )
+        else:
+            response = await self.client.achat_completion(model=model, messages=messages, **kwargs)
+
+        self._finish_turn(cache_key, user_input, response, session_id)
         return response
 
-    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+    async def stream_message_async(
+        self,
+        user_input: str,
+        session_id: str,
+        log_full_history: bool = False,
+        callbacks: Optional[List[BaseCallbackHandler]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of stream_message.
+
+        Args:
+            user_input: User's message
+            session_id: Session identifier
+            log_full_history: Whether to log full conversation history
+            callbacks: Optional LangChain callback handlers for this call
+
+        Yields:
+            Response content chunks as they arrive
+        """
+        cache_key, response = await self._abegin_turn(user_input, session_id)
+        if response is not None:
+            yield response
+            self._save_turn(user_input, response, session_id)
+            return
+
+        messages, model, kwargs = self._prepare_call(user_input, session_id, log_full_history)
+        if callbacks:
+            kwargs["callbacks"] = callbacks
+
+        if self.uses_memory_tool():
+            stream = self.client.astream_chat_completion_with_tools(
+                model, messages, [SEARCH_MEMORY_TOOL], partial(self._run_tool, session_id), **kwargs
+            )
+        else:
+            stream = self.client.astream_chat_completion(model=model, messages=messages, **kwargs)
+
+        # Call API without blocking the event loop
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+
+        self._finish_turn(cache_key, user_input, "".join(chunks), session_id)
+
+    async def send_messages_batch(
+        self,
+        items: List[tuple[str, str]],
+        concurrency: int = BATCH_CONCURRENCY,
+        log_full_history: bool = False
+    ) -> List[str]:
+        """
+        Send several messages concurrently.
+
+        Messages for different sessions are sent in parallel (at most
+        `concurrency` requests at a time, over the shared connection pool).
+        Messages for the same session are sent one after another in the
+        given order, so each sees the previous exchange in its history.
+
+        Args:
+            items: (user_input, session_id) pairs
+            concurrency: Maximum number of requests in flight
+            log_full_history: Whether to log full conversation history
+
+        Returns:
+            Responses in the same order as items
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        responses: List[Optional[str]] = [None] * len(items)
+
+        # Group item indexes by session, keeping their order
+        by_session: Dict[str, List[int]] = {}
+        for index, (_, session_id) in enumerate(items):
+            by_session.setdefault(session_id, []).append(index)
+
+        async def send_session(session_id: str, indexes: List[int]) -> None:
+            for index in indexes:
+                async with semaphore:
+                    responses[index] = await self.send_message_async(
+                        items[index][0], session_id, log_full_history
+                    )
+
+        await asyncio.gather(*(
+            send_session(session_id, indexes) for session_id, indexes in by_session.items()
+        ))
+        return responses
+
+    def get_history(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, str]]:
         """
         Get conversation history for a session.
 
         Args:
             session_id: Session identifier
+            limit: Maximum number of most recent messages to return (None for all)
+            offset: Number of most recent messages to skip
 
         Returns:
             List of message dictionaries with 'type' and 'content'
@@ -262,9 +1102,33 @@ class LLMService:
         history = self.session_memory.get_session(session_id)
         return [
             {"type": msg.type, "content": msg.content}
-            for msg in history.messages_list
+            for msg in history.tail(limit, offset)
         ]
 
+    def history_revision(self, session_id: str) -> int:
+        """
+        Get a number that changes whenever a session's history changes.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Revision number, usable as a cache key for rendered history
+        """
+        return self.session_memory.get_session(session_id).revision
+
+    def count_history(self, session_id: str) -> int:
+        """
+        Count messages in a session's conversation history.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Number of stored messages
+        """
+        return len(self.session_memory.get_session(session_id))
+
     def clear_history(self, session_id: str) -> None:
         """
         Clear conversation history for a session.
@@ -273,3 +1137,7 @@ class LLMService:
             session_id: Session identifier
         """
         self.session_memory.clear_session(session_id)
+
+    def clear_cache(self) -> None:
+        """Clear all cached responses."""
+        self.response_cache.clear()
@@ -1,7 +1,13 @@
+import atexit
+import copy
 import logging
+import queue
 import sys
 import os
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, MemoryHandler, QueueHandler, QueueListener
+
+# Background writer for the log file when init_logger(file_queue=True)
+_file_listener = None
 
 
 class OneLineExceptionFormatter(logging.Formatter):
@@ -18,6 +24,71 @@ class OneLineExceptionFormatter(logging.Formatter):
         return result
 
 
+class BufferedStreamHandler(MemoryHandler):
+    """
+    Buffer records for a StreamHandler and write them in a single call.
+
+    Records are held until the buffer reaches capacity or a record at or
+    above flushLevel arrives; the buffered batch is then formatted by the
+    target handler and written to its stream with one write() and flush().
+    """
+
+    def flush(self):
+        with self.lock:
+            if not self.target or not self.buffer:
+                return
+            target = self.target
+            text = "".join(
+                target.format(record) + target.terminator
+                for record in self.buffer
+                if record.levelno >= target.level and target.filter(record)
+            )
+            self.buffer.clear()
+
+        if text:
+            with target.lock:
+                target.stream.write(text)
+                target.stream.flush()
+
+
+class LocalQueueHandler(QueueHandler):
+    """
+    Queue records for an in-process QueueListener, leaving formatting to it.
+
+    The base QueueHandler formats each record with a default Formatter and
+    drops its exception info, so the listener's handlers could no longer
+    apply their own (one-line) exception formatting. The queue never
+    leaves the process, so records only need their message merged with
+    its args (which may be mutated after the call); exc_info and
+    stack_info are passed through for the target handlers to format.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def flush_logs():
+    """Flush any buffered log records on the root logger's handlers."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+def _stop_file_listener():
+    """Drain queued file records and stop the background writer."""
+    global _file_listener
+    if _file_listener is not None:
+        _file_listener.stop()
+        _file_listener = None
+
+
+# Runs before logging's own shutdown hook (atexit is LIFO), so queued
+# records reach the file before its handler is closed
+atexit.register(_stop_file_listener)
+
+
 def init_logger(
     log_level=logging.INFO,
     log_file="logs/cli.log",
@@ -27,6 +98,9 @@ def init_logger(
     log_file_mode="a",
     log_format="%(asctime)s %(levelname)s %(funcName)s(%(lineno)d) %(message)s",
     print_log_init=False,
+    stream_buffer_capacity=0,
+    stream_flush_level=logging.INFO,
+    file_queue=False,
 ):
     """
     Initialize logger with rotating file handler and optional stdout output.
@@ -40,10 +114,18 @@ def init_logger(
         log_file_mode: File mode ('a' for append, 'w' for overwrite)
         log_format: Log message format string
         print_log_init: Whether to print initialization message
+        stream_buffer_capacity: Buffer up to this many stdout records and
+            write them in one call (0 disables buffering)
+        stream_flush_level: Records at or above this level flush the
+            stdout buffer immediately
+        file_queue: Write the log file from a background thread, so logging
+            calls only enqueue records
 
     Returns:
         Configured logger instance
     """
+    global _file_listener
+
     try:
         main_logger = logging.getLogger()
         main_logger.setLevel(log_level)
@@ -61,8 +143,12 @@ def init_logger(
             print(f"Log directory: {log_dir}")
 
     try:
-        # Clear existing handlers to prevent duplicates
-        main_logger.handlers = []
+        # Remove and close existing handlers to prevent duplicates when
+        # called again in the same process
+        _stop_file_listener()
+        for handler in main_logger.handlers[:]:
+            main_logger.removeHandler(handler)
+            handler.close()
         main_logger.propagate = False
 
         # Add rotating file handler
@@ -76,7 +162,13 @@ def init_logger(
         )
         log_rotate_handler.setFormatter(log_formatter)
         log_rotate_handler.setLevel(log_level)
-        main_logger.addHandler(log_rotate_handler)
+        if file_queue:
+            record_queue = queue.SimpleQueue()
+            _file_listener = QueueListener(record_queue, log_rotate_handler, respect_handler_level=True)
+            _file_listener.start()
+            main_logger.addHandler(LocalQueueHandler(record_queue))
+        else:
+            main_logger.addHandler(log_rotate_handler)
 
     except Exception as e:
         print(f"Exception when creating file handler: {e}")
@@ -87,6 +179,13 @@ def init_logger(
             stream_log_handler = logging.StreamHandler(stream=sys.stdout)
             stream_log_handler.setFormatter(log_formatter)
             stream_log_handler.setLevel(log_level)
+            if stream_buffer_capacity > 0:
+                # logging.shutdown() flushes the buffer at exit
+                stream_log_handler = BufferedStreamHandler(
+                    stream_buffer_capacity,
+                    flushLevel=stream_flush_level,
+                    target=stream_log_handler,
+                )
             main_logger.addHandler(stream_log_handler)
 
     except Exception as e:
@@ -1,6 +1,62 @@
+import itertools
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
 from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_core.messages import BaseMessage
-from typing import List, Dict
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+from typing import List, Dict, Optional, Callable, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Message classes by LangChain message type, for rebuilding stored rows
+MESSAGE_TYPES = {
+    "human": HumanMessage,
+    "ai": AIMessage,
+    "system": SystemMessage,
+}
+
+# SQLite schema and statements (sqlite3 caches prepared statements by SQL text)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sess_ts ON messages (session, ts);
+"""
+_SELECT_SESSION = "SELECT role, content FROM messages WHERE session = ? ORDER BY ts, id"
+_INSERT_MESSAGE = "INSERT INTO messages (session, ts, role, content) VALUES (?, ?, ?, ?)"
+_DELETE_SESSION = "DELETE FROM messages WHERE session = ?"
+
+# Full-text index over message content, kept in sync by triggers (needs FTS5)
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE messages_fts USING fts5(content, content='messages', content_rowid='id');
+CREATE TRIGGER messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+INSERT INTO messages_fts (messages_fts) VALUES ('rebuild');
+"""
+_SEARCH_SESSION = """
+SELECT m.role, m.content FROM messages_fts f JOIN messages m ON m.id = f.rowid
+WHERE messages_fts MATCH ? AND m.session = ? ORDER BY f.rank LIMIT ?
+"""
+
+# Leading line of the system message that stands in for summarized turns
+SUMMARY_PREFIX = "Summary of earlier conversation:\n"
+
+# Source of history revision numbers, unique across all histories so a
+# (re)created session never reuses a revision seen before
+_revisions = itertools.count(1)
 
 
 class InMemoryChatHistory(BaseChatMessageHistory):
@@ -8,26 +64,197 @@ class InMemoryChatHistory(BaseChatMessageHistory):
 
     def __init__(self):
         self.messages: List[BaseMessage] = []
+        self.revision = next(_revisions)  # Changes whenever the messages do
 
     def add_message(self, message: BaseMessage) -> None:
         """Add a message to the chat history."""
         self.messages.append(message)
+        self.revision = next(_revisions)
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        """Add several messages to the chat history at once."""
+        self.messages.extend(messages)
+        self.revision = next(_revisions)
 
     def clear(self) -> None:
         """Clear all messages from history."""
-        self.messages = []
+        self.messages.clear()
+        self.revision = next(_revisions)
 
     @property
     def messages_list(self) -> List[BaseMessage]:
         """Get all messages."""
         return self.messages
 
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def tail(self, limit: Optional[int] = None, offset: int = 0) -> List[BaseMessage]:
+        """
+        Get a window of the most recent messages.
+
+        Args:
+            limit: Maximum number of messages to return (None for all)
+            offset: Number of most recent messages to skip
+
+        Returns:
+            Up to `limit` messages in chronological order, ending `offset`
+            messages before the newest one
+        """
+        end = len(self.messages) - offset
+        if end <= 0:
+            return []
+        start = 0 if limit is None else max(end - limit, 0)
+        return self.messages[start:end]
+
+    def search(self, query: str, limit: int = 5) -> List[BaseMessage]:
+        """
+        Find messages matching any term of a query.
+
+        Args:
+            query: Space-separated search terms (case-insensitive)
+            limit: Maximum number of messages to return
+
+        Returns:
+            Matching messages, best match (most terms, then most recent) first
+        """
+        terms = {term.lower() for term in query.split()}
+        if not terms:
+            return []
+
+        scored = []
+        for index, msg in enumerate(self.messages):
+            content = msg.content.lower()
+            score = sum(term in content for term in terms)
+            if score:
+                scored.append((score, index, msg))
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [msg for _, _, msg in scored[:limit]]
+
+    def compact(self, count: int, summary: BaseMessage) -> None:
+        """
+        Replace the oldest messages with a single summary message.
+
+        Args:
+            count: Number of oldest messages to replace
+            summary: Message standing in for the replaced messages
+        """
+        self.messages[:count] = [summary]
+        self.revision = next(_revisions)
+
+
+class SQLiteChatHistory(InMemoryChatHistory):
+    """Chat message history persisted to SQLite, with an in-memory copy for reads."""
+
+    def __init__(self, conn: sqlite3.Connection, session_id: str, fts: bool = False):
+        super().__init__()
+        self.conn = conn
+        self.session_id = session_id
+        self.fts = fts
+
+        # Load persisted messages for this session once
+        self.messages = [
+            MESSAGE_TYPES[role](content=content)
+            for role, content in conn.execute(_SELECT_SESSION, (session_id,))
+        ]
+
+    def add_message(self, message: BaseMessage) -> None:
+        """Add a message to the chat history and persist it."""
+        self.conn.execute(
+            _INSERT_MESSAGE,
+            (self.session_id, time.time_ns(), message.type, message.content)
+        )
+        super().add_message(message)
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        """Add several messages to the chat history and persist them in one transaction."""
+        ts = time.time_ns()
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                _INSERT_MESSAGE,
+                [
+                    (self.session_id, ts + i, msg.type, msg.content)
+                    for i, msg in enumerate(messages)
+                ]
+            )
+        super().add_messages(messages)
+
+    def clear(self) -> None:
+        """Clear all messages from history and the store."""
+        self.conn.execute(_DELETE_SESSION, (self.session_id,))
+        super().clear()
+
+    def search(self, query: str, limit: int = 5) -> List[BaseMessage]:
+        """Find messages matching any term of a query, via the FTS5 index if available."""
+        terms = query.split()
+        if not self.fts or not terms:
+            return super().search(query, limit)
+
+        # Quote each term so user text can't be parsed as FTS5 query syntax
+        match = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        rows = self.conn.execute(_SEARCH_SESSION, (match, self.session_id, limit))
+        return [MESSAGE_TYPES[role](content=content) for role, content in rows]
+
+    def compact(self, count: int, summary: BaseMessage) -> None:
+        """Replace the oldest messages with a summary and rewrite the stored session."""
+        super().compact(count, summary)
+        ts = time.time_ns()
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute(_DELETE_SESSION, (self.session_id,))
+            self.conn.executemany(
+                _INSERT_MESSAGE,
+                [
+                    (self.session_id, ts + i, msg.type, msg.content)
+                    for i, msg in enumerate(self.messages)
+                ]
+            )
+
 
 class SessionMemory:
-    """Manages multiple chat sessions with in-memory history."""
+    """
+    Manages multiple chat sessions.
 
-    def __init__(self):
+    History is kept in memory only, unless a db_path is given, in which case
+    sessions are persisted to SQLite and restored on next start. The database
+    is opened lazily on first session access.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
         self.sessions: Dict[str, InMemoryChatHistory] = {}
+        self.db_path = Path(db_path) if db_path else None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._fts = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite store on first use."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._fts = self._ensure_fts(conn)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _ensure_fts(conn: sqlite3.Connection) -> bool:
+        """Create the full-text index if missing; return whether FTS5 is usable."""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'"
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            conn.executescript(f"BEGIN;{_FTS_SCHEMA}COMMIT;")
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to scanning in memory
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            return False
+        return True
 
     def get_session(self, session_id: str) -> InMemoryChatHistory:
         """
@@ -37,18 +264,187 @@ class SessionMemory:
             session_id: Unique identifier for the session
 
         Returns:
-            InMemoryChatHistory instance for the session
+            Chat history instance for the session
         """
         if session_id not in self.sessions:
-            self.sessions[session_id] = InMemoryChatHistory()
+            if self.db_path is None:
+                self.sessions[session_id] = InMemoryChatHistory()
+            else:
+                conn = self._connect()
+                self.sessions[session_id] = SQLiteChatHistory(conn, session_id, fts=self._fts)
         return self.sessions[session_id]
 
     def clear_session(self, session_id: str) -> None:
         """Clear history for a specific session."""
         if session_id in self.sessions:
             self.sessions[session_id].clear()
+        elif self.db_path is not None:
+            self._connect().execute(_DELETE_SESSION, (session_id,))
 
     def delete_session(self, session_id: str) -> None:
         """Delete a session entirely."""
+        self.clear_session(session_id)
         if session_id in self.sessions:
             del self.sessions[session_id]
+
+    def close(self) -> None:
+        """Close the SQLite store if open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+
+# Tokenizers by model name; None when tiktoken or its encoding data is unavailable
+_encodings: Dict[str, Optional["tiktoken.Encoding"]] = {}
+_encodings_lock = threading.Lock()
+
+# Characters per token assumed when no tokenizer is available
+APPROX_CHARS_PER_TOKEN = 4
+
+
+def get_encoding(model: str = "") -> Optional["tiktoken.Encoding"]:
+    """
+    Get the tiktoken encoding for a model (cached per model name).
+
+    tiktoken downloads its encoding data on first use (then caches it on
+    disk), so the first call may block on the network. If loading fails,
+    None is cached as well, so the download is not retried on every turn
+    and token counts fall back to an estimate.
+
+    Args:
+        model: Model name (OpenAI names only; anything else falls back to
+            cl100k_base as an approximation)
+
+    Returns:
+        tiktoken Encoding instance, or None if it could not be loaded
+    """
+    # Serialized so a warm-up thread and a turn never download it twice
+    with _encodings_lock:
+        if model in _encodings:
+            return _encodings[model]
+        try:
+            # Deferred: only needed once history tokens are first counted
+            import tiktoken
+
+            try:
+                encoding = tiktoken.encoding_for_model(model.split("/")[-1])
+            except KeyError:
+                encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning(
+                "Tokenizer unavailable (%s); estimating %d characters per token",
+                e, APPROX_CHARS_PER_TOKEN
+            )
+            encoding = None
+        _encodings[model] = encoding
+        return encoding
+
+
+def token_counts(messages: List[BaseMessage], model: str = "") -> List[int]:
+    """
+    Count tokens in each message's content.
+
+    Args:
+        messages: Messages to count
+        model: Model name used to pick the tokenizer
+
+    Returns:
+        Approximate token count per message (estimated from length if no
+        tokenizer is available)
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return [len(msg.content) // APPROX_CHARS_PER_TOKEN for msg in messages]
+    return [len(encoding.encode(msg.content)) for msg in messages]
+
+
+def is_summary(message: BaseMessage) -> bool:
+    """Whether a message is a summary left by an earlier compaction."""
+    return isinstance(message, SystemMessage) and message.content.startswith(SUMMARY_PREFIX)
+
+
+def summary_message(summary: str) -> SystemMessage:
+    """Build the system message that replaces summarized turns."""
+    return SystemMessage(content=f"{SUMMARY_PREFIX}{summary}")
+
+
+def plan_compaction(
+    history: InMemoryChatHistory,
+    max_tokens: int = 6000,
+    keep_last: int = 6,
+    model: str = "",
+) -> int:
+    """
+    Decide how many of the oldest messages to fold into a summary.
+
+    Up to `keep_last` of the most recent messages are kept verbatim, fewer
+    if they would take more than half the budget, which leaves room for the
+    summary and the next turns so the compacted history is back under
+    budget. Nothing is compacted when the only message left to summarize
+    is the summary from an earlier compaction.
+
+    Args:
+        history: Chat history to compact
+        max_tokens: Token budget for the history
+        keep_last: Maximum number of most recent messages kept verbatim
+        model: Model name used to pick the tokenizer
+
+    Returns:
+        Number of oldest messages to summarize (0 if no compaction is needed)
+    """
+    messages = history.messages_list
+    sizes = token_counts(messages, model)
+    if sum(sizes) <= max_tokens:
+        return 0
+
+    # Shrink the verbatim tail until it fits in half the budget
+    tail_budget = max_tokens // 2
+    keep = min(keep_last, len(messages))
+    tail_tokens = sum(sizes[len(sizes) - keep:])
+    while keep and tail_tokens > tail_budget:
+        tail_tokens -= sizes[len(sizes) - keep]
+        keep -= 1
+    if keep < min(keep_last, len(messages)):
+        logger.info(
+            "Recent messages exceed half the %d token history budget; keeping last %d verbatim",
+            max_tokens, keep
+        )
+
+    count = len(messages) - keep
+    if count == 1 and is_summary(messages[0]):
+        # Re-summarizing the summary alone would only lose detail
+        return 0
+    return count
+
+
+def summarize_if_needed(
+    history: InMemoryChatHistory,
+    summarize: Callable[[List[BaseMessage]], str],
+    max_tokens: int = 6000,
+    keep_last: int = 6,
+    model: str = "",
+) -> bool:
+    """
+    Fold old messages into a summary once history exceeds a token budget.
+
+    The messages chosen by plan_compaction are passed to `summarize` and
+    replaced with a single system message holding the result.
+
+    Args:
+        history: Chat history to compact
+        summarize: Callable returning a summary for a list of messages
+        max_tokens: Token budget for the history
+        keep_last: Maximum number of most recent messages kept verbatim
+        model: Model name used to pick the tokenizer
+
+    Returns:
+        True if the history was compacted
+    """
+    count = plan_compaction(history, max_tokens, keep_last, model)
+    if not count:
+        return False
+
+    summary = summarize(history.messages_list[:count])
+    history.compact(count, summary_message(summary))
+    return True
@@ -1,7 +1,8 @@
 import logging
+import time
 from jinja2 import Environment, FileSystemLoader, Template
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -9,41 +10,63 @@ logger = logging.getLogger(__name__)
 class PromptBuilder:
     """Builds prompts from Jinja2 templates with hot reload support."""
 
-    def __init__(self, template_path: str):
+    def __init__(self, template_path: str, check_interval: float = 1.0):
         self.template_path = Path(template_path)
         self.template: Optional[Template] = None
         self.last_mtime: Optional[float] = None
+        self._source: Optional[str] = None  # Source of the compiled template
         self.env = Environment(loader=FileSystemLoader(self.template_path.parent))
 
         # User message template path
         self.user_template_path = self.template_path.parent / "user_prompt.jinja"
         self.user_template: Optional[Template] = None
         self.user_last_mtime: Optional[float] = None
+        self._user_source: Optional[str] = None
+
+        # Minimum seconds between mtime checks in the check_and_reload methods
+        self.check_interval = check_interval
+        self._last_check: Optional[float] = None
+        self._user_last_check: Optional[float] = None
 
     def load(self) -> Template:
         """Load template from file."""
         if not self.template_path.exists():
             raise FileNotFoundError(f"Template file not found: {self.template_path}")
 
-        self.template = self.env.get_template(self.template_path.name)
+        self._source = self.template_path.read_text(encoding="utf-8")
+        self.template = self._compile(self.template_path, self._source)
         self.last_mtime = self.template_path.stat().st_mtime
         return self.template
 
-    def check_and_reload(self) -> tuple[bool, Optional[Template]]:
+    def check_and_reload(self, force: bool = False) -> tuple[bool, Optional[Template]]:
         """
         Check if template file has been modified and reload if necessary.
 
+        Args:
+            force: Check the mtime even if the file was checked recently
+
         Returns:
             Tuple of (was_reloaded: bool, template: Optional[Template])
         """
-        if not self.template_path.exists():
+        # Skip the stat() if the file was checked recently
+        now = time.monotonic()
+        if (not force and self._last_check is not None
+                and now - self._last_check < self.check_interval):
             return False, self.template
+        self._last_check = now
 
-        current_mtime = self.template_path.stat().st_mtime
+        try:
+            current_mtime = self.template_path.stat().st_mtime
+        except FileNotFoundError:
+            return False, self.template
 
         # First load or file has been modified
         if self.last_mtime is None or current_mtime > self.last_mtime:
             try:
+                if self.template is not None and self._read_if_unchanged(self.template_path, self._source):
+                    # Touched or saved without edits: keep the compiled template
+                    self.last_mtime = current_mtime
+                    return False, self.template
                 template = self.load()
                 return True, template
             except Exception as e:
@@ -52,6 +75,28 @@ class PromptBuilder:
 
         return False, self.template
 
+    def _compile(self, path: Path, source: str) -> Template:
+        """
+        Compile template source already read from a file.
+
+        Saves get_template() reading and stat-ing the file a second time;
+        the file name is kept for error messages.
+
+        Args:
+            path: Template file the source was read from
+            source: Template source
+
+        Returns:
+            Compiled template
+        """
+        code = self.env.compile(source, path.name, str(path))
+        return self.env.template_class.from_code(self.env, code, self.env.make_globals(None))
+
+    @staticmethod
+    def _read_if_unchanged(path: Path, source: Optional[str]) -> bool:
+        """Whether a template file still holds the source it was compiled from."""
+        return source is not None and path.read_text(encoding="utf-8") == source
+
     def render(self, **variables: Any) -> str:
         """
         Render template with provided variables.
@@ -78,19 +123,31 @@ class PromptBuilder:
         if not self.user_template_path.exists():
             return None
 
-        self.user_template = self.env.get_template(self.user_template_path.name)
+        self._user_source = self.user_template_path.read_text(encoding="utf-8")
+        self.user_template = self._compile(self.user_template_path, self._user_source)
         self.user_last_mtime = self.user_template_path.stat().st_mtime
         return self.user_template
 
     def check_and_reload_user_template(self) -> bool:
         """Check if user template file has been modified and reload if necessary."""
-        if not self.user_template_path.exists():
+        # Skip the stat() if the file was checked recently
+        now = time.monotonic()
+        if self._user_last_check is not None and now - self._user_last_check < self.check_interval:
             return False
+        self._user_last_check = now
 
-        current_mtime = self.user_template_path.stat().st_mtime
+        try:
+            current_mtime = self.user_template_path.stat().st_mtime
+        except FileNotFoundError:
+            return False
 
         if self.user_last_mtime is None or current_mtime > self.user_last_mtime:
             try:
+                if (self.user_template is not None
+                        and self._read_if_unchanged(self.user_template_path, self._user_source)):
+                    # Touched or saved without edits: keep the compiled template
+                    self.user_last_mtime = current_mtime
+                    return False
                 self.load_user_template()
                 return True
             except Exception as e:
@@ -109,13 +166,11 @@ class PromptBuilder:
         Returns:
             Rendered user message string
         """
-        # Check for hot reload
+        # Check for hot reload (also performs the first load, throttled, so
+        # a missing template costs at most one stat() per check interval)
         self.check_and_reload_user_template()
 
         # If no template exists, return raw user input
-        if self.user_template is None:
-            self.load_user_template()
-
         if self.user_template is None:
             return variables.get("user_input", "")
 
@@ -0,0 +1,78 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+try:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Optional: without watchdog callers fall back to polling
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Sets an event when any watched file is created, modified or moved into place."""
+
+    def __init__(self, paths: Set[Path], changed: threading.Event):
+        self.paths = paths
+        self.changed = changed
+
+    def on_any_event(self, event: "FileSystemEvent") -> None:
+        if event.event_type not in ("created", "modified", "moved"):
+            return
+        # Editors often save by writing a temp file and renaming it over the original
+        for src in (event.src_path, getattr(event, "dest_path", "")):
+            if src and Path(src).resolve() in self.paths:
+                self.changed.set()
+                return
+
+
+class FileWatcher:
+    """Watches files on a background thread and flags when any of them change."""
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = {Path(path).resolve() for path in paths}
+        self.changed = threading.Event()
+        self.observer: Optional["Observer"] = None
+
+    def start(self) -> bool:
+        """
+        Start watching the parent directories of the watched files.
+
+        Returns:
+            True if the watcher is running, False if it could not be started
+            (including when watchdog is not installed)
+        """
+        if Observer is None:
+            logger.info("watchdog not installed; checking file mtimes each turn instead")
+            return False
+
+        handler = _ChangeHandler(self.paths, self.changed)
+        observer = Observer()
+        try:
+            for directory in {path.parent for path in self.paths}:
+                observer.schedule(handler, str(directory), recursive=False)
+            observer.start()
+        except Exception as e:
+            logger.error(f"Error starting file watcher: {e}")
+            return False
+
+        self.observer = observer
+        return True
+
+    def consume(self) -> bool:
+        """Return whether a change was seen since the last call, and reset the flag."""
+        if not self.changed.is_set():
+            return False
+        self.changed.clear()
+        return True
+
+    def stop(self) -> None:
+        """Stop the background observer thread."""
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
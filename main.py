@@ -3,10 +3,13 @@
 One Core launcher - routes to different UI adapters.
 
 Usage:
-    python main.py [adapter]
+    python main.py [adapter] [--verbose-http]
 
 Adapters:
     cli     - CLI REPL interface (default)
+
+Options:
+    --verbose-http  Log raw HTTP requests/responses from the OpenAI SDK
 """
 
 import os
@@ -14,32 +17,41 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
-# Check for required API key
-api_key = os.getenv("OPENROUTER_API_KEY")
-if not api_key:
-    print("Error: OPENROUTER_API_KEY environment variable not set")
-    print("Please add it to your .env file")
-    sys.exit(1)
-
-# Initialize core components (shared across all adapters)
-from core.config_loader import ConfigLoader
-from core.prompt_builder import PromptBuilder
-
-base_dir = Path(__file__).parent
-config_loader = ConfigLoader(base_dir / "config" / "config.yaml")
-prompt_builder = PromptBuilder(base_dir / "templates" / "prompt.jinja")
-
-# Parse command line argument (default to "cli")
-adapter = sys.argv[1] if len(sys.argv) > 1 else "cli"
-
-# Route to appropriate adapter
-if adapter == "cli":
-    from adapters.cli_ptk import run_repl
-    run_repl(config_loader, prompt_builder, api_key)
-else:
-    print(f"Error: Unknown adapter '{adapter}'")
-    print("Available adapters: cli")
-    sys.exit(1)
+
+def main() -> None:
+    """Check the environment, build the shared core components and run an adapter."""
+    # Load environment variables
+    load_dotenv()
+
+    # Check for required API key
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        print("Error: OPENROUTER_API_KEY environment variable not set")
+        print("Please add it to your .env file")
+        sys.exit(1)
+
+    # Initialize core components (shared across all adapters)
+    from core.config_loader import ConfigLoader
+    from core.prompt_builder import PromptBuilder
+
+    base_dir = Path(__file__).parent
+    config_loader = ConfigLoader(base_dir / "config" / "config.yaml")
+    prompt_builder = PromptBuilder(base_dir / "templates" / "prompt.jinja")
+
+    # Parse command line arguments (adapter defaults to "cli")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    verbose_http = "--verbose-http" in sys.argv[1:]
+    adapter = args[0] if args else "cli"
+
+    # Route to appropriate adapter
+    if adapter == "cli":
+        from adapters.cli_ptk import run_repl
+        run_repl(config_loader, prompt_builder, api_key, verbose_http=verbose_http)
+    else:
+        print(f"Error: Unknown adapter '{adapter}'")
+        print("Available adapters: cli")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()